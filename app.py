@@ -3,8 +3,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers.ai_conversation.endpoint import ai_convo_router
+from routers.ai_dict.endpoint import ai_dict_router
 from routers.websocket.endpoint import websocket_router
 from routers.test.endpoint import test_router
+from routers.replay.endpoint import replay_router
 from dotenv import load_dotenv
 
 load_dotenv(".env")
@@ -23,10 +25,12 @@ app.add_middleware(
 def start():
     app = FastAPI()
     app.include_router(ai_convo_router)
+    app.include_router(ai_dict_router)
     return app
 
 
 app.include_router(websocket_router)
 app.include_router(test_router)
+app.include_router(replay_router)
 
 app.mount("/api", start())
@@ -0,0 +1,15 @@
+import os
+
+# Concurrent LLM + TTS jobs across the whole process.
+ADMISSION_CAPACITY = int(os.getenv("ADMISSION_CAPACITY", "8"))
+# Concurrent jobs per tenant/user.
+ADMISSION_PER_TENANT_LIMIT = int(os.getenv("ADMISSION_PER_TENANT_LIMIT", "2"))
+# Reject instead of queueing when the estimated wait exceeds this many seconds.
+ADMISSION_QUEUE_SLO_SECONDS = float(os.getenv("ADMISSION_QUEUE_SLO_SECONDS", "5.0"))
+# Initial estimate of a job's duration, refined as jobs complete.
+ADMISSION_INITIAL_SERVICE_SECONDS = 3.0
+# Weight of the newest sample in the wait/service time moving averages.
+ADMISSION_EWMA_WEIGHT = 0.2
+
+# WebSocket close code used when a turn is shed (1013 = Try Again Later).
+ADMISSION_CLOSE_CODE = 1013
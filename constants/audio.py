@@ -0,0 +1,14 @@
+import os
+
+# Post-processing applied to every synthesized chunk before it is sent.
+AUDIO_FRAME_MS = 10
+AUDIO_SILENCE_DBFS = -45.0
+AUDIO_MAX_GAP_MS = int(os.getenv("AUDIO_MAX_GAP_MS", "250"))
+AUDIO_TARGET_DBFS = float(os.getenv("AUDIO_TARGET_DBFS", "-20.0"))
+AUDIO_MAX_GAIN_DB = 12.0
+# Weight of the newest chunk when raising gain between chunks (0..1].
+AUDIO_GAIN_SMOOTHING = 0.5
+
+# Allowed per-user speaking rate multipliers (1.0 = model default).
+AUDIO_MIN_SPEAKING_RATE = 0.5
+AUDIO_MAX_SPEAKING_RATE = 2.0
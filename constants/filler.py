@@ -0,0 +1,21 @@
+import os
+
+# Seconds to wait for the real answer's first audio before playing a filler clip.
+FILLER_THRESHOLD_SECONDS = float(os.getenv("FILLER_THRESHOLD_SECONDS", "0.6"))
+
+# Short acknowledgment phrases per persona, split by the kind of user turn
+# they respond to. Synthesized once at startup.
+FILLER_PHRASES = {
+    "Lexa": {
+        "question": ["Good question.", "Hmm, let me think.", "Let me check."],
+        "statement": ["Got it.", "Okay.", "Right."],
+    },
+    "Tutor": {
+        "question": ["Good question.", "Let's see.", "Okay, let me explain."],
+        "statement": ["Nice try.", "Okay, let's look at that.", "Alright."],
+    },
+    "RealPerson": {
+        "question": ["Hmm.", "Oh, good question.", "Let me think."],
+        "statement": ["Yeah.", "Mm-hm.", "Oh, okay."],
+    },
+}
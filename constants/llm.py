@@ -0,0 +1,30 @@
+import os
+
+# Provider name -> backend kind and model. Routes refer to providers by name.
+LLM_PROVIDERS = {
+    "ollama-llama3.2": {"kind": "ollama", "model": "llama3.2:1b"},
+    "openai-gpt-4.1": {"kind": "openai", "model": "gpt-4.1"},
+    "openai-gpt-4.1-mini": {"kind": "openai", "model": "gpt-4.1-mini"},
+}
+
+# Route name -> ordered providers (primary first, then hedges) and the number
+# of seconds to wait for the primary's first token before hedging.
+LLM_ROUTES = {
+    "voice_chat": {
+        "providers": ["ollama-llama3.2", "openai-gpt-4.1-mini"],
+        "hedge_after": float(os.getenv("LLM_VOICE_CHAT_HEDGE_AFTER", "1.5")),
+    },
+    "ws_chat": {
+        "providers": ["openai-gpt-4.1", "ollama-llama3.2"],
+        "hedge_after": float(os.getenv("LLM_WS_CHAT_HEDGE_AFTER", "2.0")),
+    },
+    # Background conversation compaction; latency matters less than cost
+    "summary": {
+        "providers": ["openai-gpt-4.1-mini", "ollama-llama3.2"],
+        "hedge_after": 10.0,
+    },
+}
+
+# Circuit breaker: open after this many consecutive failures, retry after cooldown.
+LLM_BREAKER_FAILURE_THRESHOLD = 3
+LLM_BREAKER_RESET_SECONDS = 30.0
@@ -0,0 +1,9 @@
+import os
+
+# Directory holding the append-only audio segment files.
+REPLAY_DIR = os.getenv("REPLAY_DIR", "replay")
+# A new segment file is started once the active one reaches this size.
+REPLAY_SEGMENT_BYTES = 64 * 1024 * 1024
+# Retention: oldest segments are deleted past either limit.
+REPLAY_MAX_TOTAL_BYTES = int(os.getenv("REPLAY_MAX_TOTAL_BYTES", str(1024**3)))
+REPLAY_MAX_AGE_SECONDS = int(os.getenv("REPLAY_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
@@ -0,0 +1,7 @@
+import os
+
+# Seconds a framed-protocol session (and its in-flight turn) survives a disconnect.
+SESSION_GRACE_SECONDS = float(os.getenv("SESSION_GRACE_SECONDS", "30"))
+# Ring buffer bounds for frames kept for resumption.
+SESSION_BUFFER_MAX_FRAMES = 2000
+SESSION_BUFFER_MAX_BYTES = 8 * 1024 * 1024
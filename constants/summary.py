@@ -0,0 +1,14 @@
+import os
+
+# Start compacting once the conversation history exceeds this many tokens.
+SUMMARY_TRIGGER_TOKENS = int(os.getenv("SUMMARY_TRIGGER_TOKENS", "3000"))
+# Most recent turns kept verbatim, by token budget.
+SUMMARY_KEEP_RECENT_TOKENS = int(os.getenv("SUMMARY_KEEP_RECENT_TOKENS", "1000"))
+# Cached conversation summaries kept in memory.
+SUMMARY_MAX_CONVERSATIONS = 1000
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation between a user and an assistant for the "
+    "assistant's own memory. Keep names, facts the user shared, goals, "
+    "mistakes being worked on and anything promised. Be concise, plain text."
+)
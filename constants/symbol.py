@@ -1 +1,5 @@
 VOICE_STREAM_END = "^#^"
+
+# WebSocket subprotocol for the framed binary protocol (see helper/stream_protocol.py).
+# Clients that do not request it get the legacy text/bytes/VOICE_STREAM_END protocol.
+FRAMED_PROTOCOL_V1 = "estudy.voice.v1"
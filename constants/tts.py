@@ -0,0 +1,17 @@
+# Normalized sentences whose phoneme ids are memoized, per voice.
+TTS_CACHE_SIZE = 4096
+
+# Expanded before phonemization; matched case-insensitively as whole tokens.
+TTS_ABBREVIATIONS = {
+    "e.g.": "for example",
+    "i.e.": "that is",
+    "etc.": "et cetera",
+    "vs.": "versus",
+    "Mr.": "mister",
+    "Mrs.": "missus",
+    "Ms.": "miz",
+    "Dr.": "doctor",
+    "St.": "street",
+    "approx.": "approximately",
+    "&": "and",
+}
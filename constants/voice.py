@@ -0,0 +1,21 @@
+import os
+
+# Fast, lower quality model of the same speaker, used for the first sentences
+# of a turn. Tiering is disabled if the file is missing.
+VOICE_FAST_PATH = os.getenv(
+    "VOICE_FAST_PATH", r"voices\en_US-hfc_female-low\en_US-hfc_female-low.onnx"
+)
+
+TIER_FAST = "fast"
+TIER_QUALITY = "quality"
+
+# Per persona: how many leading sentences of a turn use the fast tier, and
+# whether every sentence uses it while new voice turns would wait for an
+# admission slot.
+VOICE_TIER_POLICY = {
+    "Lexa": {"fast_sentences": 1, "fast_when_overloaded": True},
+    "RealPerson": {"fast_sentences": 1, "fast_when_overloaded": True},
+    # Learners imitate pronunciation, so keep quality unless overloaded
+    "Tutor": {"fast_sentences": 0, "fast_when_overloaded": True},
+}
+DEFAULT_VOICE_TIER_POLICY = {"fast_sentences": 1, "fast_when_overloaded": True}
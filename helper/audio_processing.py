@@ -0,0 +1,183 @@
+import math
+from typing import Any, Optional
+
+import numpy as np
+from piper import SynthesisConfig
+
+import constants.audio as audio_config
+
+
+def _db_to_amplitude(db: float) -> float:
+    return float(10 ** (db / 20))
+
+
+class AudioPostProcessor:
+    """
+    Streaming post-processing for int16 mono PCM: collapses silence longer
+    than a maximum gap and normalizes loudness chunk by chunk.
+
+    Each chunk is processed as soon as it arrives using only state carried
+    over from earlier chunks, so no lookahead latency is added. Create one
+    instance per turn.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        max_gap_ms: int = audio_config.AUDIO_MAX_GAP_MS,
+        target_dbfs: float = audio_config.AUDIO_TARGET_DBFS,
+        silence_dbfs: float = audio_config.AUDIO_SILENCE_DBFS,
+        frame_ms: int = audio_config.AUDIO_FRAME_MS,
+    ):
+        self.frame_size = max(1, sample_rate * frame_ms // 1000)
+        self.max_gap_frames = max_gap_ms // frame_ms
+        self.target_rms = _db_to_amplitude(target_dbfs)
+        self.silence_rms = _db_to_amplitude(silence_dbfs)
+        self.max_gain = _db_to_amplitude(audio_config.AUDIO_MAX_GAIN_DB)
+        self.smoothing = audio_config.AUDIO_GAIN_SMOOTHING
+
+        # Silent frames already emitted at the end of the previous chunk
+        self.trailing_silence = 0
+        self.gain: Optional[float] = None
+
+    def process(self, audio: bytes) -> bytes:
+        """Process one chunk of int16 PCM and return the processed bytes."""
+        samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+        if samples.size == 0:
+            return b""
+
+        n_frames = -(-samples.size // self.frame_size)
+        padded = np.zeros(n_frames * self.frame_size, dtype=np.float32)
+        padded[: samples.size] = samples
+        frames = padded.reshape(n_frames, self.frame_size)
+
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        voiced = rms > self.silence_rms
+
+        # Position of each frame within its silence run, continuing the run
+        # left over from the previous chunk
+        index = np.arange(n_frames)
+        last_voiced = np.maximum.accumulate(
+            np.where(voiced, index, -1 - self.trailing_silence)
+        )
+        silence_position = index - last_voiced - 1
+        keep = voiced | (silence_position < self.max_gap_frames)
+
+        if voiced.any():
+            self.trailing_silence = int(n_frames - 1 - index[voiced][-1])
+            self._update_gain(rms[voiced])
+        else:
+            self.trailing_silence += n_frames
+        self.trailing_silence = min(self.trailing_silence, self.max_gap_frames)
+
+        out = frames[keep].reshape(-1)
+        # Drop the zero padding if the last frame was kept
+        if keep[-1]:
+            out = out[: out.size - (padded.size - samples.size)]
+
+        gain = self.gain if self.gain is not None else 1.0
+        peak = float(np.max(np.abs(out))) if out.size else 0.0
+        if peak * gain > 0.99:
+            gain = 0.99 / peak
+
+        return (out * (gain * 32767.0)).astype(np.int16).tobytes()
+
+    def _update_gain(self, voiced_rms: np.ndarray):
+        level = float(np.sqrt(np.mean(voiced_rms * voiced_rms)))
+        gain = min(self.target_rms / level, self.max_gain)
+        # Turn down immediately, turn up gradually
+        if self.gain is None or gain < self.gain:
+            self.gain = gain
+        else:
+            self.gain += self.smoothing * (gain - self.gain)
+
+
+def trim_silence(
+    audio: bytes,
+    sample_rate: int,
+    silence_dbfs: float = audio_config.AUDIO_SILENCE_DBFS,
+    frame_ms: int = audio_config.AUDIO_FRAME_MS,
+) -> bytes:
+    """
+    Remove leading and trailing silence from a complete int16 mono clip.
+
+    Args:
+        audio (bytes): PCM of the whole clip
+        sample_rate (int): Sample rate of the clip
+        silence_dbfs (float): Frames at or below this level count as silence
+        frame_ms (int): Frame length used to measure the level
+
+    Returns:
+        bytes: PCM from the first to the last voiced frame
+    """
+    samples = np.frombuffer(audio, dtype=np.int16)
+    frame_size = max(1, sample_rate * frame_ms // 1000)
+    n_frames = samples.size // frame_size
+    if n_frames == 0:
+        return audio
+
+    frames = samples[: n_frames * frame_size].astype(np.float32) / 32768.0
+    frames = frames.reshape(n_frames, frame_size)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    voiced = np.flatnonzero(rms > _db_to_amplitude(silence_dbfs))
+    if voiced.size == 0:
+        return b""
+
+    start = int(voiced[0]) * frame_size
+    end = min(samples.size, (int(voiced[-1]) + 1) * frame_size)
+    return samples[start:end].tobytes()
+
+
+def synthesis_config(speaking_rate: Any) -> Optional[SynthesisConfig]:
+    """
+    Build a Piper synthesis config for a per-user speaking rate.
+
+    Args:
+        speaking_rate (Any): Rate multiplier from the client (1.0 = normal);
+            anything that is not a finite positive number is ignored
+
+    Returns:
+        Optional[SynthesisConfig]: Config with the matching length scale,
+        or None to use the model default
+    """
+    if isinstance(speaking_rate, bool) or not isinstance(
+        speaking_rate, (int, float, str)
+    ):
+        return None
+    try:
+        rate = float(speaking_rate)
+    except ValueError:
+        return None
+    if not math.isfinite(rate) or rate <= 0 or rate == 1.0:
+        return None
+
+    rate = min(
+        max(rate, audio_config.AUDIO_MIN_SPEAKING_RATE),
+        audio_config.AUDIO_MAX_SPEAKING_RATE,
+    )
+    return SynthesisConfig(length_scale=1.0 / rate)
+
+
+def resample_int16(audio: bytes, from_rate: int, to_rate: int) -> bytes:
+    """
+    Resample int16 mono PCM by linear interpolation.
+
+    Args:
+        audio (bytes): PCM at from_rate
+        from_rate (int): Source sample rate
+        to_rate (int): Target sample rate
+
+    Returns:
+        bytes: PCM at to_rate
+    """
+    if from_rate == to_rate or not audio:
+        return audio
+
+    samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
+    n_out = int(round(samples.size * to_rate / from_rate))
+    positions = np.arange(n_out) * (from_rate / to_rate)
+    return (
+        np.interp(positions, np.arange(samples.size), samples)
+        .astype(np.int16)
+        .tobytes()
+    )
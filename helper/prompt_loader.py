@@ -1,5 +1,8 @@
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from helper.tokens import estimate_message_tokens, estimate_tokens
 
 
 def read_prompt(file_path: str) -> str:
@@ -59,8 +62,7 @@ def load_prompt_to_messages(
         prompt_name.strip().replace("..", "").replace("/", "").replace("\\", "")
     )
 
-    prompt_file_path = f"prompts/{prompt_name}.md"
-    prompt_content = read_prompt(prompt_file_path)
+    prompt_content = read_static_prompt(prompt_name)
 
     system_message = {"role": "system", "content": prompt_content}
 
@@ -102,3 +104,56 @@ def set_prompt_to_messages(
         messages.insert(0, system_message)
 
     return messages
+
+
+@lru_cache(maxsize=None)
+def read_static_prompt(prompt_name: str) -> str:
+    """
+    Read a persona prompt from prompts/ once and reuse the same string, so
+    the static prompt prefix stays byte-identical between turns.
+
+    Args:
+        prompt_name (str): Name of the prompt file (without .md extension)
+
+    Returns:
+        str: Content of the prompt file
+    """
+    return read_prompt(f"prompts/{prompt_name}.md")
+
+
+def assemble_prompt(
+    history: List[Dict[str, Any]], persona: str, context: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Build the messages for a turn with static segments before dynamic ones:
+    persona, then conversation context, then summary and history. This keeps
+    the longest possible prefix cacheable by the provider.
+
+    Args:
+        history (List[Dict[str, Any]]): Conversation messages; leading system
+            messages are treated as the conversation summary
+        persona (str): Name of the persona prompt file
+        context (Optional[str]): Per-conversation context, if any
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, int]]: The messages and the
+        estimated token count of each segment
+    """
+    persona_message = {"role": "system", "content": read_static_prompt(persona)}
+    messages = [persona_message]
+    segment_tokens = {"persona": estimate_tokens(persona_message["content"])}
+
+    if context and context.strip():
+        context_message = {"role": "system", "content": context}
+        messages.append(context_message)
+        segment_tokens["context"] = estimate_tokens(context)
+
+    summary_count = 0
+    while (
+        summary_count < len(history) and history[summary_count].get("role") == "system"
+    ):
+        summary_count += 1
+    segment_tokens["summary"] = estimate_message_tokens(history[:summary_count])
+    segment_tokens["history"] = estimate_message_tokens(history[summary_count:])
+
+    return messages + history, segment_tokens
@@ -0,0 +1,89 @@
+import re
+from typing import AsyncIterator, List, Optional
+
+import constants.tts as tts_config
+
+# A sentence ends at . ! ? (optionally followed by closing quotes/brackets)
+# when followed by whitespace. Every line break ends one too, so list items,
+# headings and paragraphs are never merged with the next line.
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n\s*")
+# "1." at the start of a line is a list marker, not a sentence
+_LIST_MARKER = re.compile(r"(?:^|\n)[ \t]*\d+\.$")
+_FENCE = "```"
+# Abbreviations that are expanded before phonemization don't end a sentence
+_ABBREVIATIONS = {
+    abbreviation.lower()
+    for abbreviation in tts_config.TTS_ABBREVIATIONS
+    if abbreviation.endswith(".")
+}
+
+
+def _continues(text: str) -> bool:
+    """True if a period at the end of text belongs to a list marker or abbreviation."""
+    if _LIST_MARKER.search(text):
+        return True
+    words = text.rsplit(None, 1)
+    return bool(words) and words[-1].lstrip("([\"'*_").lower() in _ABBREVIATIONS
+
+
+def _sentence_end(buffer: str) -> Optional[int]:
+    """End index of the first complete sentence in buffer, or None if incomplete."""
+    stripped = buffer.lstrip()
+    if stripped.startswith(_FENCE):
+        # A code block is kept whole, however many lines it spans
+        start = len(buffer) - len(stripped) + len(_FENCE)
+        close = buffer.find(_FENCE, start)
+        return None if close == -1 else close + len(_FENCE)
+
+    for match in _SENTENCE_END.finditer(buffer):
+        if "\n" not in match.group() and _continues(buffer[: match.start()]):
+            continue
+        return match.end()
+    return None
+
+
+async def iter_sentences(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Group a stream of LLM tokens into complete sentences.
+
+    Args:
+        tokens (AsyncIterator[str]): Streamed text fragments
+
+    Yields:
+        str: Each complete, stripped sentence as soon as it is available
+    """
+    buffer = ""
+    async for token in tokens:
+        buffer += token
+        while True:
+            end = _sentence_end(buffer)
+            if end is None:
+                break
+            sentence = buffer[:end].strip()
+            buffer = buffer[end:]
+            if sentence:
+                yield sentence
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split complete text into stripped, non-empty sentences.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        List[str]: The sentences in order
+    """
+    sentences = []
+    while True:
+        end = _sentence_end(text)
+        if end is None:
+            break
+        sentences.append(text[:end].strip())
+        text = text[end:]
+    sentences.append(text.strip())
+    return [sentence for sentence in sentences if sentence]
@@ -0,0 +1,119 @@
+import struct
+from typing import Tuple
+
+# Every frame is a single binary WebSocket message: a fixed header followed
+# by the payload. All integers are big-endian.
+#
+#   version        u8   PROTOCOL_VERSION
+#   frame_type     u8   FRAME_* below
+#   sample_format  u8   SAMPLE_FORMAT_* below (NONE for non-audio frames)
+#   flags          u8   reserved, 0
+#   turn_id        u32  increments per assistant turn in a session
+#   sequence       u32  increments per frame in a session
+#   text_start     u32  byte offset where the sentence starts
+#   text_end       u32  byte offset where it ends (exclusive)
+#
+# Numbering belongs to the session, not the socket: it continues across
+# reconnects so a client can resume after the last sequence it received.
+# Offsets count bytes of the UTF-8 encoded turn text (the TURN_END payload),
+# not characters, so they mean the same thing in every client language.
+#
+# Payloads:
+#   TURN_START  u32 sample rate of the turn's audio
+#   TEXT        UTF-8 sentence text, aligned by text_start/text_end
+#   AUDIO       PCM for the sentence at text_start/text_end
+#   FILLER      PCM not aligned to any text (latency masking clip)
+#   TURN_END    UTF-8 full turn text
+#   ERROR       UTF-8 error message
+
+PROTOCOL_VERSION = 1
+
+FRAME_TURN_START = 1
+FRAME_TEXT = 2
+FRAME_AUDIO = 3
+FRAME_FILLER = 4
+FRAME_TURN_END = 5
+FRAME_ERROR = 6
+
+SAMPLE_FORMAT_NONE = 0
+SAMPLE_FORMAT_PCM_S16LE = 1
+
+HEADER = struct.Struct("!BBBBIIII")
+
+
+def encode_frame(
+    frame_type: int,
+    turn_id: int,
+    sequence: int,
+    payload: bytes = b"",
+    text_start: int = 0,
+    text_end: int = 0,
+    sample_format: int = SAMPLE_FORMAT_NONE,
+) -> bytes:
+    """Pack a frame header and payload into one binary message."""
+    header = HEADER.pack(
+        PROTOCOL_VERSION,
+        frame_type,
+        sample_format,
+        0,
+        turn_id,
+        sequence,
+        text_start,
+        text_end,
+    )
+    return header + payload
+
+
+def decode_frame(frame: bytes) -> Tuple[Tuple[int, ...], bytes]:
+    """
+    Split a binary message into its header fields and payload.
+
+    Returns:
+        Tuple[Tuple[int, ...], bytes]: (version, frame_type, sample_format,
+        flags, turn_id, sequence, text_start, text_end) and the payload
+    """
+    if len(frame) < HEADER.size:
+        raise ValueError("Frame is shorter than the protocol header")
+    return HEADER.unpack_from(frame), frame[HEADER.size :]
+
+
+class FrameWriter:
+    """Assigns turn ids and sequence numbers for frames in one session."""
+
+    def __init__(self):
+        self.turn_id = 0
+        self.sequence = 0
+
+    def _frame(self, frame_type: int, payload: bytes, **kwargs) -> bytes:
+        self.sequence += 1
+        return encode_frame(frame_type, self.turn_id, self.sequence, payload, **kwargs)
+
+    def turn_start(self, sample_rate: int) -> bytes:
+        self.turn_id += 1
+        return self._frame(FRAME_TURN_START, struct.pack("!I", sample_rate))
+
+    def text(self, sentence: str, text_start: int, text_end: int) -> bytes:
+        return self._frame(
+            FRAME_TEXT,
+            sentence.encode("utf-8"),
+            text_start=text_start,
+            text_end=text_end,
+        )
+
+    def audio(self, pcm: bytes, text_start: int, text_end: int) -> bytes:
+        return self._frame(
+            FRAME_AUDIO,
+            pcm,
+            text_start=text_start,
+            text_end=text_end,
+            sample_format=SAMPLE_FORMAT_PCM_S16LE,
+        )
+
+    def filler(self, pcm: bytes) -> bytes:
+        return self._frame(FRAME_FILLER, pcm, sample_format=SAMPLE_FORMAT_PCM_S16LE)
+
+    def turn_end(self, full_text: str) -> bytes:
+        return self._frame(FRAME_TURN_END, full_text.encode("utf-8"))
+
+    def error(self, message: str) -> bytes:
+        return self._frame(FRAME_ERROR, message.encode("utf-8"))
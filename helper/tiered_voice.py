@@ -0,0 +1,80 @@
+import logging
+import os
+from typing import AsyncIterator, Iterator, Optional
+
+from piper import PiperVoice, SynthesisConfig
+from starlette.concurrency import run_in_threadpool
+
+import constants.voice as voice_config
+from helper.audio_processing import resample_int16
+from helper.tts_frontend import PiperFrontEnd
+from managers.admission_manager import admission, Priority
+
+
+class TieredVoice:
+    """
+    Pairs the quality Piper model with a fast model of the same speaker and
+    picks one per sentence. Fast-tier audio is resampled to the quality
+    model's sample rate so a turn's stream has a single format.
+    """
+
+    def __init__(
+        self, quality: PiperVoice, fast_path: str = voice_config.VOICE_FAST_PATH
+    ):
+        self.quality = quality
+        self.sample_rate = quality.config.sample_rate
+        self.fast: Optional[PiperVoice] = None
+        # Phoneme ids depend on the model's id map, so each voice gets its own cache
+        self.quality_frontend = PiperFrontEnd(quality)
+        self.fast_frontend: Optional[PiperFrontEnd] = None
+        if os.path.exists(fast_path):
+            self.fast = PiperVoice.load(fast_path)
+            self.fast_frontend = PiperFrontEnd(self.fast)
+        else:
+            logging.warning(f"Fast voice not found at {fast_path}, tiering disabled")
+
+    def choose_tier(self, persona: str, sentence_index: int) -> str:
+        """Pick the tier for a sentence from the persona policy and current load."""
+        if self.fast is None:
+            return voice_config.TIER_QUALITY
+
+        policy = voice_config.VOICE_TIER_POLICY.get(
+            persona, voice_config.DEFAULT_VOICE_TIER_POLICY
+        )
+        if sentence_index < policy["fast_sentences"]:
+            return voice_config.TIER_FAST
+        # Overloaded when a new voice turn would have to wait for a slot; BATCH
+        # work and tenants held back by their own cap don't count
+        if (
+            policy["fast_when_overloaded"]
+            and admission.estimate_wait(Priority.INTERACTIVE) > 0
+        ):
+            return voice_config.TIER_FAST
+        return voice_config.TIER_QUALITY
+
+    async def synthesize(
+        self, text: str, tier: str, syn_config: Optional[SynthesisConfig] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize text with the given tier, yielding int16 PCM chunks.
+
+        Phonemization and inference run in the threadpool one chunk at a
+        time, so the event loop keeps serving timers, replays and other
+        connections while Piper works.
+        """
+        chunks = self._synthesize(text, tier, syn_config)
+        while True:
+            pcm = await run_in_threadpool(next, chunks, None)
+            if pcm is None:
+                return
+            yield pcm
+
+    def _synthesize(
+        self, text: str, tier: str, syn_config: Optional[SynthesisConfig]
+    ) -> Iterator[bytes]:
+        frontend = self.quality_frontend
+        if tier == voice_config.TIER_FAST and self.fast_frontend is not None:
+            frontend = self.fast_frontend
+        rate = frontend.voice.config.sample_rate
+        for pcm in frontend.synthesize(text, syn_config):
+            yield resample_int16(pcm, rate, self.sample_rate)
@@ -0,0 +1,30 @@
+from typing import Any, Dict, List
+
+# Rough average for English text with GPT-style tokenizers.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a piece of text.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate number of tokens
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """
+    Estimate the token count of a list of chat messages.
+
+    Args:
+        messages (List[Dict[str, Any]]): Chat messages
+
+    Returns:
+        int: Approximate number of tokens, including per-message overhead
+    """
+    return sum(estimate_tokens(str(m.get("content", ""))) + 4 for m in messages)
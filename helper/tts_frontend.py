@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from piper import PiperVoice, SynthesisConfig
+
+import constants.tts as tts_config
+from helper.sentence_splitter import split_sentences
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_MD_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+# An unclosed block (cut off by the end of a streamed reply) runs to the end
+_MD_CODE_BLOCK = re.compile(r"```.*?(?:```|$)", re.DOTALL)
+_MD_INLINE_CODE = re.compile(r"`([^`\n]*)`")
+# Emphasis markers only when they wrap text, so "2*3" or snake_case survive
+_MD_EMPHASIS = re.compile(r"(?<![\w*~])(\*\*|__|\*|_|~~)(?=\S)(.+?)(?<=\S)\1(?![\w*~])")
+# Unpaired markers at a word edge, left when a sentence split an emphasis span
+_MD_STRAY_EMPHASIS = re.compile(
+    r"(?<!\S)(?:\*\*|__|~~|\*)(?=\S)|(?<=\S)(?:\*\*|__|~~|\*)(?!\S)"
+)
+_MD_LINE_PREFIX = re.compile(r"^\s*(#{1,6}\s+|>\s*|[-*+]\s+|\d+[.)]\s+)", re.MULTILINE)
+_URL = re.compile(r"https?://\S+")
+_LINE_END = re.compile(r"[.!?][\"')\]]*$")
+_WHITESPACE = re.compile(r"\s+")
+
+# espeak-ng keeps global state, so phonemization is serialized across voices
+# and threads; ONNX inference runs concurrently
+_PHONEMIZE_LOCK = threading.Lock()
+
+
+def _is_emoji(char: str) -> bool:
+    return unicodedata.category(char) == "So" or 0x1F000 <= ord(char) <= 0x1FAFF
+
+
+def _join_lines(text: str) -> str:
+    """
+    Join lines into one line, ending each but the last as a sentence so list
+    items and headings are read apart instead of as one run-on sentence.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    ended = [
+        line if _LINE_END.search(line) else line.rstrip(":;,") + "."
+        for line in lines[:-1]
+    ]
+    return " ".join(ended + lines[-1:])
+
+
+def normalize_text(text: str) -> str:
+    """
+    Prepare LLM output for speech: strip markdown, HTML and emoji, turn
+    lines and list items into sentences and expand abbreviations. Numbers
+    are left to espeak, which reads ordinals, times and dates itself.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Text to phonemize
+    """
+    text = _MD_CODE_BLOCK.sub(" ", text)
+    text = _HTML_TAG.sub(" ", text)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _URL.sub(" ", text)
+    text = _MD_LINE_PREFIX.sub("", text)
+    text = _MD_INLINE_CODE.sub(r"\1", text)
+    text = _MD_EMPHASIS.sub(r"\2", text)
+    text = _MD_STRAY_EMPHASIS.sub("", text)
+    text = "".join(" " if _is_emoji(c) else c for c in text)
+    # Line breaks become sentence boundaries before whitespace is collapsed
+    text = _join_lines(text)
+
+    for abbreviation, expansion in tts_config.TTS_ABBREVIATIONS.items():
+        text = re.sub(
+            rf"(?<!\w){re.escape(abbreviation)}(?!\w)",
+            expansion,
+            text,
+            flags=re.IGNORECASE,
+        )
+
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class FrontEndStats:
+    """
+    Front-end (normalization + phonemization) vs model time across voices.
+    Updated from threadpool threads, so counters change under a lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sentences = 0
+        self.cache_hits = 0
+        self.frontend_seconds = 0.0
+        self.model_seconds = 0.0
+
+    def record(
+        self,
+        sentences: int = 0,
+        cache_hits: int = 0,
+        frontend_seconds: float = 0.0,
+        model_seconds: float = 0.0,
+    ):
+        with self.lock:
+            self.sentences += sentences
+            self.cache_hits += cache_hits
+            self.frontend_seconds += frontend_seconds
+            self.model_seconds += model_seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "sentences": self.sentences,
+                "cache_hits": self.cache_hits,
+                "cache_hit_ratio": (
+                    round(self.cache_hits / self.sentences, 3)
+                    if self.sentences
+                    else 0.0
+                ),
+                "frontend_seconds": round(self.frontend_seconds, 3),
+                "model_seconds": round(self.model_seconds, 3),
+            }
+
+
+frontend_stats = FrontEndStats()
+
+
+class PiperFrontEnd:
+    """
+    Runs text normalization and espeak phonemization for one Piper voice,
+    memoizing phoneme ids per normalized sentence in a bounded LRU, and feeds
+    the ids straight into the voice's ONNX model.
+    """
+
+    def __init__(self, voice: PiperVoice, max_entries: int = tts_config.TTS_CACHE_SIZE):
+        self.voice = voice
+        self.max_entries = max_entries
+        self.cache: "OrderedDict[str, List[List[int]]]" = OrderedDict()
+
+    def phoneme_ids(self, sentence: str) -> List[List[int]]:
+        """Phoneme ids for a normalized sentence (espeak may split it further)."""
+        with _PHONEMIZE_LOCK:
+            # Timed inside the lock so waiting for it isn't counted as work
+            start = time.perf_counter()
+            cached = self.cache.get(sentence)
+            if cached is not None:
+                self.cache.move_to_end(sentence)
+                frontend_stats.record(
+                    sentences=1,
+                    cache_hits=1,
+                    frontend_seconds=time.perf_counter() - start,
+                )
+                return cached
+
+            ids = [
+                self.voice.phonemes_to_ids(p) for p in self.voice.phonemize(sentence)
+            ]
+            self.cache[sentence] = ids
+            if len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+            frontend_stats.record(
+                sentences=1, frontend_seconds=time.perf_counter() - start
+            )
+            return ids
+
+    def synthesize(
+        self, text: str, syn_config: Optional[SynthesisConfig] = None
+    ) -> Iterator[bytes]:
+        """Synthesize text, yielding int16 PCM per sentence."""
+        syn_config = syn_config or SynthesisConfig()
+
+        start = time.perf_counter()
+        sentences = split_sentences(normalize_text(text))
+        frontend_stats.record(frontend_seconds=time.perf_counter() - start)
+
+        for sentence in sentences:
+            for ids in self.phoneme_ids(sentence):
+                yield self._infer(ids, syn_config)
+
+    def _infer(self, ids: List[int], syn_config: SynthesisConfig) -> bytes:
+        start = time.perf_counter()
+        audio = self.voice.phoneme_ids_to_audio(ids, syn_config)
+        frontend_stats.record(model_seconds=time.perf_counter() - start)
+
+        # Same post-inference scaling as PiperVoice.synthesize
+        if syn_config.normalize_audio:
+            peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+            audio = audio / peak if peak >= 1e-8 else np.zeros_like(audio)
+        if syn_config.volume != 1.0:
+            audio = audio * syn_config.volume
+        audio = np.clip(audio, -1.0, 1.0)
+        return (audio * 32767).astype(np.int16).tobytes()
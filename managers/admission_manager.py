@@ -0,0 +1,186 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, List, Tuple
+
+import constants.admission as admission_config
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+
+    INTERACTIVE = 0
+    PREWARM = 1
+    BATCH = 2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a job is shed because its queue wait would exceed the SLO."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Server busy, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class AdmissionSlot:
+    """A granted slot, handed back with AdmissionController.release()."""
+
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.started_at = time.monotonic()
+        self.released = False
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        capacity: int,
+        per_tenant_limit: int,
+        queue_slo_seconds: float,
+    ):
+        self.capacity = capacity
+        self.per_tenant_limit = per_tenant_limit
+        self.queue_slo_seconds = queue_slo_seconds
+
+        self.running = 0
+        self.running_per_tenant: Dict[str, int] = {}
+        # Heap of (priority, arrival order, tenant, future)
+        self.queue: List[Tuple[int, int, str, asyncio.Future]] = []
+        self.order = itertools.count()
+
+        self.avg_service_seconds = admission_config.ADMISSION_INITIAL_SERVICE_SECONDS
+        self.avg_wait_seconds = 0.0
+
+    def estimate_wait(self, priority: Priority, tenant: str = "") -> float:
+        """Estimate queue wait for a new job of the given priority and tenant."""
+        # Waiters held back by their own tenant cap don't compete for free slots
+        ahead = sum(
+            1
+            for entry in self.queue
+            if entry[0] <= priority
+            and self.running_per_tenant.get(entry[2], 0) < self.per_tenant_limit
+        )
+        slots = self.capacity - self.running - ahead
+        if self.running_per_tenant.get(tenant, 0) >= self.per_tenant_limit:
+            slots = min(slots, 0)
+        if slots > 0:
+            return 0.0
+        return (1 - slots) / self.capacity * self.avg_service_seconds
+
+    async def acquire(
+        self, tenant: str, priority: Priority = Priority.INTERACTIVE
+    ) -> AdmissionSlot:
+        """
+        Wait for a slot, queueing by priority. The caller must pass the
+        returned slot to release() once its work is over.
+
+        Raises:
+            AdmissionRejected: If the estimated wait exceeds the queue SLO
+        """
+        estimated = self.estimate_wait(priority, tenant)
+        if estimated > self.queue_slo_seconds:
+            raise AdmissionRejected(retry_after=math.ceil(estimated))
+
+        enqueued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.queue, (int(priority), next(self.order), tenant, future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before cancellation, give it back
+                self._release(tenant)
+            else:
+                self.queue = [entry for entry in self.queue if entry[3] is not future]
+                heapq.heapify(self.queue)
+            raise
+
+        slot = AdmissionSlot(tenant)
+        self.avg_wait_seconds = self._ewma(
+            self.avg_wait_seconds, slot.started_at - enqueued_at
+        )
+        return slot
+
+    def release(self, slot: AdmissionSlot):
+        """Give a slot back. Releasing the same slot again does nothing."""
+        if slot.released:
+            return
+        slot.released = True
+        self.avg_service_seconds = self._ewma(
+            self.avg_service_seconds, time.monotonic() - slot.started_at
+        )
+        self._release(slot.tenant)
+
+    @asynccontextmanager
+    async def admit(self, tenant: str, priority: Priority = Priority.INTERACTIVE):
+        """
+        Hold a slot for the duration of the block, queueing by priority.
+
+        Raises:
+            AdmissionRejected: If the estimated wait exceeds the queue SLO
+        """
+        slot = await self.acquire(tenant, priority)
+        try:
+            yield
+        finally:
+            self.release(slot)
+
+    def stats(self) -> Dict[str, object]:
+        """Current queue depth and wait times."""
+        depth = {p.name.lower(): 0 for p in Priority}
+        for entry in self.queue:
+            depth[Priority(entry[0]).name.lower()] += 1
+        return {
+            "running": self.running,
+            "capacity": self.capacity,
+            "queue_depth": len(self.queue),
+            "queue_depth_by_priority": depth,
+            "avg_wait_seconds": round(self.avg_wait_seconds, 3),
+            "avg_service_seconds": round(self.avg_service_seconds, 3),
+            "estimated_wait_seconds": round(
+                self.estimate_wait(Priority.INTERACTIVE), 3
+            ),
+        }
+
+    def _release(self, tenant: str):
+        self.running -= 1
+        self.running_per_tenant[tenant] -= 1
+        if not self.running_per_tenant[tenant]:
+            del self.running_per_tenant[tenant]
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start the highest priority waiters whose tenant is under its cap."""
+        skipped = []
+        while self.queue and self.running < self.capacity:
+            entry = heapq.heappop(self.queue)
+            tenant, future = entry[2], entry[3]
+            if future.done():
+                continue
+            if self.running_per_tenant.get(tenant, 0) >= self.per_tenant_limit:
+                skipped.append(entry)
+                continue
+            self.running += 1
+            self.running_per_tenant[tenant] = self.running_per_tenant.get(tenant, 0) + 1
+            future.set_result(None)
+
+        for entry in skipped:
+            heapq.heappush(self.queue, entry)
+
+    @staticmethod
+    def _ewma(average: float, sample: float) -> float:
+        weight = admission_config.ADMISSION_EWMA_WEIGHT
+        return average + weight * (sample - average)
+
+
+admission = AdmissionController(
+    admission_config.ADMISSION_CAPACITY,
+    admission_config.ADMISSION_PER_TENANT_LIMIT,
+    admission_config.ADMISSION_QUEUE_SLO_SECONDS,
+)
@@ -0,0 +1,89 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from piper import PiperVoice
+
+import constants.filler as filler_config
+from helper.audio_processing import AudioPostProcessor, trim_silence
+
+
+class FillerManager:
+    def __init__(self, voice: PiperVoice, phrases: Dict[str, Dict[str, List[str]]]):
+        """
+        Pre-synthesize every filler phrase with the given voice, trimmed and
+        normalized like the streamed replies so there is no loudness jump.
+        """
+        self.clips: Dict[str, Dict[str, List[bytes]]] = {
+            persona: {
+                kind: [self._synthesize(voice, text) for text in texts]
+                for kind, texts in kinds.items()
+            }
+            for persona, kinds in phrases.items()
+        }
+        self.next_index: Dict[str, int] = {}
+
+    @staticmethod
+    def _synthesize(voice: PiperVoice, text: str) -> bytes:
+        sample_rate = voice.config.sample_rate
+        audio = b"".join(chunk.audio_int16_bytes for chunk in voice.synthesize(text))
+        # One processor per clip: the gain is measured on the clip itself
+        audio = AudioPostProcessor(sample_rate).process(audio)
+        return trim_silence(audio, sample_rate)
+
+    def pick(self, persona: str, messages: List[Dict[str, Any]]) -> Optional[bytes]:
+        """
+        Pick a filler clip for the persona, rotating through clips that fit
+        the last user message (question or statement).
+        """
+        kinds = self.clips.get(persona)
+        if not kinds:
+            return None
+
+        last_user = next(
+            (
+                m.get("content", "")
+                for m in reversed(messages)
+                if m.get("role") == "user"
+            ),
+            "",
+        )
+        kind = "question" if str(last_user).rstrip().endswith("?") else "statement"
+        clips = kinds.get(kind) or next(iter(kinds.values()))
+
+        key = f"{persona}:{kind}"
+        index = self.next_index.get(key, 0)
+        self.next_index[key] = (index + 1) % len(clips)
+        return clips[index]
+
+    async def with_filler(
+        self,
+        persona: str,
+        messages: List[Dict[str, Any]],
+        audio: AsyncIterator[bytes],
+        threshold: float = filler_config.FILLER_THRESHOLD_SECONDS,
+    ) -> AsyncIterator[bytes]:
+        """
+        Forward an audio stream, yielding a filler clip first if the stream's
+        first chunk takes longer than the threshold.
+        """
+        first = asyncio.ensure_future(audio.__anext__())
+        done, _ = await asyncio.wait({first}, timeout=threshold)
+        if not done:
+            clip = self.pick(persona, messages)
+            if clip:
+                yield clip
+
+        try:
+            try:
+                yield await first
+            except StopAsyncIteration:
+                return
+
+            async for chunk in audio:
+                yield chunk
+        finally:
+            # Release the wrapped stream's resources if the client goes away
+            if not first.done():
+                first.cancel()
+                await asyncio.wait({first})
+            await audio.aclose()
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from openai import AsyncOpenAI
+from ollama import AsyncClient
+
+import constants.llm as llm_config
+
+
+class CircuitBreaker:
+    """Stop calling a provider after repeated failures, then probe it again."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # True while the single half-open probe is in flight
+        self.probing = False
+
+    def allow(self) -> bool:
+        """
+        Return True if a request may be sent. Once the cooldown has elapsed
+        only one probe is let through until it succeeds or fails.
+        """
+        if self.opened_at is None:
+            return True
+        if self.probing or time.monotonic() - self.opened_at < self.reset_seconds:
+            return False
+        self.probing = True
+        return True
+
+    def release(self):
+        """Give back a probe that ended without a success or failure."""
+        self.probing = False
+
+    def record_success(self):
+        """Close the breaker."""
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        """Count a failure and open the breaker once the threshold is reached."""
+        self.failures += 1
+        self.probing = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class LLMProvider(ABC):
+    """Base class for a streaming chat completion backend."""
+
+    def __init__(self, name: str, model: str):
+        self.name = name
+        self.model = model
+
+    @abstractmethod
+    def stream(
+        self, messages: List[Dict[str, Any]], usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        """
+        Stream the assistant reply as text fragments, filling `usage` with
+        prompt_tokens and cached_tokens once the provider reports them.
+        """
+
+
+class OpenAIProvider(LLMProvider):
+    def __init__(self, name: str, model: str):
+        super().__init__(name, model)
+        self.client: Optional[AsyncOpenAI] = None
+
+    async def stream(
+        self, messages: List[Dict[str, Any]], usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        # Created lazily so the API key from .env is loaded by then
+        if self.client is None:
+            self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in response:
+            if chunk.usage:
+                usage["prompt_tokens"] = chunk.usage.prompt_tokens
+                details = chunk.usage.prompt_tokens_details
+                usage["cached_tokens"] = (details.cached_tokens or 0) if details else 0
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class OllamaProvider(LLMProvider):
+    def __init__(self, name: str, model: str):
+        super().__init__(name, model)
+        self.client = AsyncClient()
+
+    async def stream(
+        self, messages: List[Dict[str, Any]], usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        response = await self.client.chat(self.model, messages=messages, stream=True)
+        async for chunk in response:
+            if chunk.done:
+                # Ollama does not report how much of the prompt came from cache
+                usage["prompt_tokens"] = chunk.prompt_eval_count or 0
+                usage["cached_tokens"] = 0
+            if chunk.message.content:
+                yield chunk.message.content
+
+
+PROVIDER_KINDS = {"openai": OpenAIProvider, "ollama": OllamaProvider}
+
+
+class LLMManager:
+    def __init__(self, providers: Dict[str, Dict[str, str]], routes: Dict[str, Any]):
+        self.providers: Dict[str, LLMProvider] = {
+            name: PROVIDER_KINDS[spec["kind"]](name, spec["model"])
+            for name, spec in providers.items()
+        }
+        self.routes = routes
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(
+                llm_config.LLM_BREAKER_FAILURE_THRESHOLD,
+                llm_config.LLM_BREAKER_RESET_SECONDS,
+            )
+            for name in self.providers
+        }
+        # Route name -> accumulated prompt token accounting
+        self.usage: Dict[str, Dict[str, Any]] = {}
+
+    async def stream(
+        self,
+        route: str,
+        messages: List[Dict[str, Any]],
+        segment_tokens: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a reply for a route, hedging to the next provider if the
+        current one has produced no token within the route's deadline.
+
+        The first provider to produce a token wins; the others are cancelled.
+        `segment_tokens` (estimated tokens per prompt segment) is recorded
+        with the provider-reported prompt and cached token counts.
+        """
+        config = self.routes[route]
+        candidates = [
+            self.providers[name]
+            for name in config["providers"]
+            if self.breakers[name].allow()
+        ]
+        if not candidates:
+            raise RuntimeError(f"No available LLM provider for route '{route}'")
+
+        winner, first_token = await self._race_first_token(
+            candidates, messages, config["hedge_after"]
+        )
+        provider, generator, usage = winner
+
+        try:
+            if first_token is not None:
+                yield first_token
+                async for token in generator:
+                    yield token
+        except Exception:
+            self.breakers[provider.name].record_failure()
+            raise
+        finally:
+            await generator.aclose()
+            # Cancelled or abandoned by the caller: free a half-open probe
+            self.breakers[provider.name].release()
+
+        self.breakers[provider.name].record_success()
+        self._record_usage(route, usage, segment_tokens or {})
+
+    def _record_usage(
+        self, route: str, usage: Dict[str, int], segment_tokens: Dict[str, int]
+    ):
+        stats = self.usage.setdefault(
+            route,
+            {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "segments": {}},
+        )
+        stats["requests"] += 1
+        stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        stats["cached_tokens"] += usage.get("cached_tokens", 0)
+        for segment, tokens in segment_tokens.items():
+            stats["segments"][segment] = stats["segments"].get(segment, 0) + tokens
+
+    def usage_stats(self) -> Dict[str, Any]:
+        """Per-route prompt tokens, cached tokens and cache hit ratio."""
+        return {
+            route: {
+                **stats,
+                "cache_hit_ratio": (
+                    round(stats["cached_tokens"] / stats["prompt_tokens"], 3)
+                    if stats["prompt_tokens"]
+                    else 0.0
+                ),
+            }
+            for route, stats in self.usage.items()
+        }
+
+    async def _race_first_token(self, candidates, messages, hedge_after):
+        pending: Dict[asyncio.Task, Any] = {}
+        remaining = list(candidates)
+        last_error: Optional[BaseException] = None
+
+        def launch():
+            provider = remaining.pop(0)
+            usage: Dict[str, int] = {}
+            generator = provider.stream(messages, usage)
+            task = asyncio.ensure_future(generator.__anext__())
+            pending[task] = (provider, generator, usage)
+
+        launch()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending.keys(),
+                    timeout=hedge_after if remaining else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logging.info("LLM first token deadline passed, hedging")
+                    launch()
+                    continue
+
+                for task in done:
+                    provider, generator, usage = pending.pop(task)
+                    try:
+                        token = task.result()
+                    except StopAsyncIteration:
+                        return (provider, generator, usage), None
+                    except Exception as e:
+                        logging.error(f"LLM provider {provider.name} failed: {e}")
+                        self.breakers[provider.name].record_failure()
+                        last_error = e
+                        # Fail over immediately instead of waiting for the deadline
+                        if remaining and not pending:
+                            launch()
+                        continue
+                    return (provider, generator, usage), token
+        finally:
+            # Providers that lost the race or were never launched give back
+            # their half-open probe
+            for provider in remaining:
+                self.breakers[provider.name].release()
+            for task, (provider, generator, _) in pending.items():
+                task.cancel()
+                self.breakers[provider.name].release()
+                asyncio.ensure_future(self._discard(task, generator))
+
+        raise RuntimeError(f"All LLM providers failed: {last_error}")
+
+    @staticmethod
+    async def _discard(task: asyncio.Task, generator):
+        try:
+            await task
+        except BaseException:
+            pass
+        try:
+            await generator.aclose()
+        except BaseException:
+            pass
+
+
+llm_manager = LLMManager(llm_config.LLM_PROVIDERS, llm_config.LLM_ROUTES)
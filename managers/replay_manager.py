@@ -0,0 +1,206 @@
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Optional, Tuple
+
+import constants.replay as replay_config
+
+# Record layout: header, conversation id, message id, PCM audio.
+# Header: magic, conversation id length, message id length, sample rate,
+# created timestamp, PCM length.
+RECORD_MAGIC = b"RPLY"
+RECORD_HEADER = struct.Struct("!4sHHIdI")
+
+
+class ReplayEntry:
+    def __init__(
+        self, segment: int, offset: int, length: int, sample_rate: int, created: float
+    ):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.sample_rate = sample_rate
+        self.created = created
+
+
+class ReplayStore:
+    """
+    Append-only segment files holding synthesized audio per assistant message.
+    Reads are served from memory-mapped segments; retention drops whole
+    segments, oldest first.
+    """
+
+    def __init__(
+        self, directory: str, segment_bytes: int, max_total_bytes: int, max_age: int
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_age = max_age
+
+        self.index: Dict[Tuple[str, str], ReplayEntry] = {}
+        self.segment_updated: Dict[int, float] = {}
+        self.maps: Dict[int, mmap.mmap] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        self.active = max(self.segment_updated, default=0)
+        # Apply retention left over from before the restart
+        self._enforce_retention()
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:08d}.seg")
+
+    def _load(self):
+        """
+        Rebuild the index by scanning record headers of existing segments.
+
+        Only headers and ids are read; the audio is skipped with a seek. A
+        segment ending in a partial or corrupt record (e.g. a crash during
+        append) is truncated to its last complete record so later appends
+        don't land behind the garbage.
+        """
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".seg"):
+                continue
+            segment = int(name[:-4])
+            path = self._path(segment)
+            with open(path, "rb") as file:
+                size = os.fstat(file.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    record = self._read_record(file, offset, size)
+                    if record is None:
+                        break
+                    conversation_id, message_id, rate, created, pcm_len, end = record
+                    self.index[(conversation_id, message_id)] = ReplayEntry(
+                        segment, end - pcm_len, pcm_len, rate, created
+                    )
+                    self.segment_updated[segment] = created
+                    offset = end
+
+            if offset < size:
+                logging.error(
+                    f"Truncating replay segment {name} from {size} to {offset} bytes"
+                )
+                if offset:
+                    os.truncate(path, offset)
+                else:
+                    os.remove(path)
+
+    @staticmethod
+    def _read_record(file, offset: int, size: int):
+        """Parse the record at offset, or return None if it is incomplete."""
+        file.seek(offset)
+        header = file.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return None
+        magic, conv_len, msg_len, rate, created, pcm_len = RECORD_HEADER.unpack(header)
+        end = offset + RECORD_HEADER.size + conv_len + msg_len + pcm_len
+        if magic != RECORD_MAGIC or end > size:
+            return None
+        keys = file.read(conv_len + msg_len)
+        try:
+            conversation_id = keys[:conv_len].decode("utf-8")
+            message_id = keys[conv_len:].decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        return conversation_id, message_id, rate, created, pcm_len, end
+
+    def append(
+        self, conversation_id: str, message_id: str, pcm: bytes, sample_rate: int
+    ):
+        """Persist a finished turn's audio."""
+        if not pcm:
+            return
+
+        path = self._path(self.active)
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+            self.active += 1
+            path = self._path(self.active)
+
+        conv = conversation_id.encode("utf-8")
+        msg = message_id.encode("utf-8")
+        now = time.time()
+        header = RECORD_HEADER.pack(
+            RECORD_MAGIC, len(conv), len(msg), sample_rate, now, len(pcm)
+        )
+
+        with open(path, "ab") as file:
+            offset = file.tell()
+            file.write(header + conv + msg + pcm)
+
+        self.segment_updated[self.active] = now
+        self.index[(conversation_id, message_id)] = ReplayEntry(
+            self.active,
+            offset + len(header) + len(conv) + len(msg),
+            len(pcm),
+            sample_rate,
+            now,
+        )
+        self._enforce_retention()
+
+    def get(self, conversation_id: str, message_id: str) -> Optional[ReplayEntry]:
+        """Look up a message's audio, ignoring entries past the age limit."""
+        entry = self.index.get((conversation_id, message_id))
+        if entry is None or time.time() - entry.created > self.max_age:
+            return None
+        return entry
+
+    def read(
+        self, entry: ReplayEntry, start: int = 0, end: Optional[int] = None
+    ) -> bytes:
+        """Read bytes [start, end) of an entry's audio through the segment's mmap."""
+        end = entry.length if end is None else min(end, entry.length)
+        view = self._map(entry.segment, entry.offset + entry.length)
+        return view[entry.offset + start : entry.offset + end]
+
+    def _map(self, segment: int, needed: int) -> mmap.mmap:
+        view = self.maps.get(segment)
+        # The active segment grows; remap once a read goes past the mapped size
+        if view is None or len(view) < needed:
+            if view is not None:
+                view.close()
+            with open(self._path(segment), "rb") as file:
+                view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.maps[segment] = view
+        return view
+
+    def _enforce_retention(self):
+        sizes = {
+            segment: os.path.getsize(self._path(segment))
+            for segment in self.segment_updated
+        }
+        total = sum(sizes.values())
+        cutoff = time.time() - self.max_age
+
+        for segment in sorted(self.segment_updated):
+            if segment == self.active:
+                break
+            if (
+                total <= self.max_total_bytes
+                and self.segment_updated[segment] >= cutoff
+            ):
+                break
+            self._drop_segment(segment)
+            total -= sizes[segment]
+
+    def _drop_segment(self, segment: int):
+        view = self.maps.pop(segment, None)
+        if view is not None:
+            view.close()
+        self.index = {
+            key: entry for key, entry in self.index.items() if entry.segment != segment
+        }
+        del self.segment_updated[segment]
+        os.remove(self._path(segment))
+
+
+replay_store = ReplayStore(
+    replay_config.REPLAY_DIR,
+    replay_config.REPLAY_SEGMENT_BYTES,
+    replay_config.REPLAY_MAX_TOTAL_BYTES,
+    replay_config.REPLAY_MAX_AGE_SECONDS,
+)
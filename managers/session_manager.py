@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from fastapi import WebSocket
+
+import constants.session as session_config
+from helper.stream_protocol import HEADER, FrameWriter
+
+
+class Session:
+    """
+    Framed-protocol state for one conversation that outlives its socket:
+    sequence numbering, a ring buffer of recently sent frames, and the
+    in-flight turn.
+    """
+
+    def __init__(self, conversation_id: str, manager: "SessionManager"):
+        self.conversation_id = conversation_id
+        self.manager = manager
+
+        self.writer = FrameWriter()
+        self.frames: Deque[Tuple[int, bytes]] = deque()
+        self.buffered_bytes = 0
+
+        self.websocket: Optional[WebSocket] = None
+        # Serializes live sends with the replay done on reconnect
+        self.send_lock = asyncio.Lock()
+        self.turn_lock = asyncio.Lock()
+        self.turn_task: Optional[asyncio.Task] = None
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+    async def send(self, frame: bytes):
+        """Buffer a frame and send it if a socket is attached."""
+        sequence = HEADER.unpack_from(frame)[5]
+        self.frames.append((sequence, frame))
+        self.buffered_bytes += len(frame)
+        while self.frames and (
+            len(self.frames) > self.manager.max_frames
+            or self.buffered_bytes > self.manager.max_bytes
+        ):
+            _, dropped = self.frames.popleft()
+            self.buffered_bytes -= len(dropped)
+
+        async with self.send_lock:
+            websocket = self.websocket
+            if websocket is None:
+                return
+            try:
+                await websocket.send_bytes(frame)
+            except Exception:
+                # Keep generating into the buffer; the client may resume
+                self.manager.detach(self, websocket)
+
+    async def replay(self, websocket: WebSocket, last_sequence: int) -> bool:
+        """
+        Send buffered frames after last_sequence, then attach the socket.
+
+        Returns:
+            bool: False if frames after last_sequence were already evicted
+        """
+        async with self.send_lock:
+            # A sequence beyond ours means the session expired and was recreated
+            complete = last_sequence <= self.writer.sequence and (
+                self.frames[0][0] <= last_sequence + 1
+                if self.frames
+                else last_sequence == self.writer.sequence
+            )
+            for sequence, frame in list(self.frames):
+                if sequence > last_sequence:
+                    await websocket.send_bytes(frame)
+            self.websocket = websocket
+        return complete
+
+
+class SessionManager:
+    def __init__(self, grace_seconds: float, max_frames: int, max_bytes: int):
+        self.grace_seconds = grace_seconds
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.sessions: Dict[str, Session] = {}
+
+    async def attach(
+        self,
+        conversation_id: str,
+        websocket: WebSocket,
+        last_sequence: Optional[int] = None,
+    ) -> Tuple[Session, bool]:
+        """
+        Attach a socket to the conversation's session, creating it if needed,
+        and resume after last_sequence if given.
+
+        Returns:
+            Tuple[Session, bool]: The session and whether resumption was complete
+        """
+        session = self.sessions.get(conversation_id)
+        if session is None:
+            session = Session(conversation_id, self)
+            self.sessions[conversation_id] = session
+
+        if session.expiry is not None:
+            session.expiry.cancel()
+            session.expiry = None
+
+        if last_sequence is None:
+            session.websocket = websocket
+            return session, True
+        return session, await session.replay(websocket, last_sequence)
+
+    def detach(self, session: Session, websocket: WebSocket):
+        """Detach a socket and keep the session alive for the grace period."""
+        if session.websocket is not websocket and session.websocket is not None:
+            # A newer connection already took over
+            return
+        session.websocket = None
+        if session.expiry is None:
+            session.expiry = asyncio.get_running_loop().call_later(
+                self.grace_seconds, self._expire, session
+            )
+
+    def _expire(self, session: Session):
+        if session.websocket is not None:
+            return
+        if session.turn_task is not None and not session.turn_task.done():
+            logging.info(
+                f"Cancelling turn for {session.conversation_id}, client did not resume"
+            )
+            session.turn_task.cancel()
+        if self.sessions.get(session.conversation_id) is session:
+            del self.sessions[session.conversation_id]
+
+
+session_manager = SessionManager(
+    session_config.SESSION_GRACE_SECONDS,
+    session_config.SESSION_BUFFER_MAX_FRAMES,
+    session_config.SESSION_BUFFER_MAX_BYTES,
+)
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import constants.summary as summary_config
+from helper.tokens import estimate_message_tokens
+from managers.admission_manager import admission, AdmissionRejected, Priority
+from managers.llm_manager import llm_manager
+
+
+def _fingerprint(messages: List[Dict[str, Any]]) -> str:
+    return hashlib.sha1(
+        json.dumps(
+            [(m.get("role"), m.get("content")) for m in messages], ensure_ascii=False
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class ConversationSummary:
+    def __init__(self):
+        self.text = ""
+        # Number of leading history messages folded into the summary
+        self.covered = 0
+        self.fingerprint = _fingerprint([])
+        self.task: Optional[asyncio.Task] = None
+
+
+class SummaryManager:
+    def __init__(self, trigger_tokens: int, keep_recent_tokens: int, max_entries: int):
+        self.trigger_tokens = trigger_tokens
+        self.keep_recent_tokens = keep_recent_tokens
+        self.max_entries = max_entries
+        # Least recently used conversations are evicted first
+        self.summaries: "OrderedDict[str, ConversationSummary]" = OrderedDict()
+
+    def compact(
+        self, conversation_id: str, messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace older turns with the cached summary and schedule a refresh
+        in the background when the history grows past the trigger.
+
+        Leading system messages are kept as they are. The summary is never
+        awaited here, so compaction adds no latency to the turn.
+        """
+        system_count = 0
+        while (
+            system_count < len(messages)
+            and messages[system_count].get("role") == "system"
+        ):
+            system_count += 1
+        system, history = messages[:system_count], messages[system_count:]
+
+        state = self.summaries.setdefault(conversation_id, ConversationSummary())
+        self.summaries.move_to_end(conversation_id)
+        if len(self.summaries) > self.max_entries:
+            self.summaries.popitem(last=False)
+        if state.covered > len(history) or state.fingerprint != _fingerprint(
+            history[: state.covered]
+        ):
+            # History was edited or belongs to another session; start over
+            state = self.summaries[conversation_id] = ConversationSummary()
+
+        if estimate_message_tokens(history[state.covered :]) > self.trigger_tokens:
+            self._schedule_refresh(conversation_id, state, history)
+
+        if not state.covered:
+            return messages
+
+        summary_message = {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{state.text}",
+        }
+        return system + [summary_message] + history[state.covered :]
+
+    def _schedule_refresh(
+        self,
+        conversation_id: str,
+        state: ConversationSummary,
+        history: List[Dict[str, Any]],
+    ):
+        if state.task is not None and not state.task.done():
+            return
+
+        # Keep the most recent turns verbatim within the token budget
+        cut = len(history)
+        recent_tokens = 0
+        while cut > state.covered:
+            recent_tokens += estimate_message_tokens([history[cut - 1]])
+            if recent_tokens > self.keep_recent_tokens:
+                break
+            cut -= 1
+        if cut <= state.covered:
+            return
+
+        state.task = asyncio.ensure_future(
+            self._refresh(conversation_id, state, history[:cut])
+        )
+
+    async def _refresh(
+        self,
+        conversation_id: str,
+        state: ConversationSummary,
+        folded: List[Dict[str, Any]],
+    ):
+        """
+        Fold the newly aged-out turns into the existing summary. Runs as batch
+        work under admission control and is skipped when the server is shedding
+        load; the next turn schedules it again.
+        """
+        new_turns = "\n".join(
+            f"{m.get('role')}: {m.get('content')}" for m in folded[state.covered :]
+        )
+        prompt = [
+            {"role": "system", "content": summary_config.SUMMARY_INSTRUCTIONS},
+            {
+                "role": "user",
+                "content": f"Existing summary:\n{state.text or '(none)'}\n\n"
+                f"New turns:\n{new_turns}",
+            },
+        ]
+        try:
+            async with admission.admit(conversation_id, Priority.BATCH):
+                text = "".join(
+                    [token async for token in llm_manager.stream("summary", prompt)]
+                )
+        except AdmissionRejected:
+            logging.info(f"Skipping summary refresh for {conversation_id}, server busy")
+            return
+        except Exception as e:
+            logging.error(f"Failed to summarize conversation: {e}")
+            return
+
+        state.text = text.strip()
+        state.covered = len(folded)
+        state.fingerprint = _fingerprint(folded)
+
+
+summary_manager = SummaryManager(
+    summary_config.SUMMARY_TRIGGER_TOKENS,
+    summary_config.SUMMARY_KEEP_RECENT_TOKENS,
+    summary_config.SUMMARY_MAX_CONVERSATIONS,
+)
@@ -11,10 +11,19 @@ class WebSocketManager:
         """Add a new WebSocket connection."""
         self.connections[connection_id] = connection
 
-    def remove_connection(self, connection_id: str):
-        """Remove a WebSocket connection."""
-        if connection_id in self.connections:
-            del self.connections[connection_id]
+    def remove_connection(
+        self, connection_id: str, connection: Optional[WebSocket] = None
+    ):
+        """
+        Remove a WebSocket connection. If a connection is given, the entry is
+        only removed while it still refers to that socket, so a handler
+        cleaning up after itself can't drop a newer, reconnected socket.
+        """
+        if connection_id not in self.connections:
+            return
+        if connection is not None and self.connections[connection_id] is not connection:
+            return
+        del self.connections[connection_id]
 
     def send_text(self, connection_id: str, message: str):
         """Send a message to a specific WebSocket connection."""
@@ -62,12 +71,18 @@ class WebSocketManager:
         for connection_id in closed_connections:
             self.remove_connection(connection_id)
 
-    async def close_connection(self, connection_id: str):
-        """Close a specific WebSocket connection."""
-        if connection_id in self.connections:
+    async def close_connection(
+        self, connection_id: str, connection: Optional[WebSocket] = None
+    ):
+        """
+        Close a specific WebSocket connection. If a connection is given, that
+        socket is closed and only its own entry is removed.
+        """
+        if connection is not None or connection_id in self.connections:
             try:
                 # Check if connection is still open before trying to close
-                connection = self.connections[connection_id]
+                if connection is None:
+                    connection = self.connections[connection_id]
                 if (
                     hasattr(connection, "client_state") and connection.client_state == 1
                 ):  # CONNECTED state
@@ -77,7 +92,7 @@ class WebSocketManager:
                 pass
             finally:
                 # Always remove from connections dict
-                self.remove_connection(connection_id)
+                self.remove_connection(connection_id, connection)
 
 
 manager = WebSocketManager()
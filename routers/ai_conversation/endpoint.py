@@ -1,14 +1,46 @@
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import StreamingResponse
 from piper import PiperVoice
-from ollama import chat
 from helper.prompt_loader import load_prompt_to_messages
+from helper.sentence_splitter import iter_sentences
+from helper.audio_processing import AudioPostProcessor, synthesis_config
+from helper.tiered_voice import TieredVoice
+from managers.llm_manager import llm_manager
+from managers.filler_manager import FillerManager
+from managers.admission_manager import (
+    admission,
+    AdmissionRejected,
+    AdmissionSlot,
+    Priority,
+)
+from constants.filler import FILLER_PHRASES
 
 ai_convo_router = APIRouter()
 
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    Streaming response that gives its admission slot back once the response
+    is over, even if the body iterator never started (e.g. the client left
+    before the first byte).
+    """
+
+    def __init__(self, content, slot: AdmissionSlot, **kwargs):
+        super().__init__(content, **kwargs)
+        self.slot = slot
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            admission.release(self.slot)
+
+
 # Load the Piper voice model
 VOICE_PATH = r"D:\dev\AI\Voices\en_US-hfc_female-medium\en_US-hfc_female-medium.onnx"
 voice = PiperVoice.load(VOICE_PATH)
+tiered_voice = TieredVoice(voice)
+fillers = FillerManager(voice, {"RealPerson": FILLER_PHRASES["RealPerson"]})
 
 
 @ai_convo_router.post(
@@ -22,18 +54,36 @@ async def voicechat_endpoint(request: Request):
     if not messages:
         raise HTTPException(status_code=400, detail="Missing 'messages' in JSON body")
 
-    response = chat(
-        "llama3.2:1b", messages=load_prompt_to_messages(messages, "RealPerson")
-    )
+    messages = load_prompt_to_messages(messages, "RealPerson")
+    tokens = llm_manager.stream("voice_chat", messages)
+    syn_config = synthesis_config(payload.get("speaking_rate"))
+    post_processor = AudioPostProcessor(voice.config.sample_rate)
 
-    tts_gen = voice.synthesize(response.message.content)
+    # Held until the response finishes, released by AdmittedStreamingResponse
+    try:
+        slot = await admission.acquire(
+            request.headers.get("X-User-Id") or request.client.host,
+            Priority.INTERACTIVE,
+        )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after))},
+        )
 
-    def generate():
-        for chunk in tts_gen:
-            yield chunk.audio_int16_bytes
+    async def generate():
+        # Synthesize each sentence as soon as the LLM finishes it
+        index = 0
+        async for sentence in iter_sentences(tokens):
+            tier = tiered_voice.choose_tier("RealPerson", index)
+            async for pcm in tiered_voice.synthesize(sentence, tier, syn_config):
+                yield post_processor.process(pcm)
+            index += 1
 
-    return StreamingResponse(
-        generate(),
+    return AdmittedStreamingResponse(
+        fillers.with_filler("RealPerson", messages, generate()),
+        slot,
         media_type="audio/L16",
         headers={"Transfer-Encoding": "chunked"},
     )
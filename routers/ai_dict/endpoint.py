@@ -1,21 +1,41 @@
 import os
 from openai import OpenAI
-from fastapi import APIRouter, Request, HTTPException, Response
+from fastapi import APIRouter, Request, HTTPException
+from starlette.concurrency import run_in_threadpool
+from managers.admission_manager import admission, AdmissionRejected, Priority
 from .types import DictionaryEntry
 
 ai_dict_router = APIRouter()
 
 
 @ai_dict_router.post("/dict")
-def dict_endpoint(request: Request):
-    data = request.json()
+async def dict_endpoint(request: Request):
+    data = await request.json()
     term = data.get("term", "")
     if not term:
         raise HTTPException(status_code=400, detail="Missing 'term' in JSON body")
 
+    # Dictionary lookups yield to interactive voice turns
+    priority = Priority.PREWARM if data.get("prewarm") else Priority.BATCH
+    tenant = request.headers.get("X-User-Id") or request.client.host
+
+    try:
+        async with admission.admit(tenant, priority):
+            response = await run_in_threadpool(lookup_term, term)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after))},
+        )
+
+    return response.output_parsed
+
+
+def lookup_term(term: str):
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-    response = client.responses.parse(
+    return client.responses.parse(
         model="gpt-4o-mini",
         input=[
             {"role": "system", "content": "You are a dictionary."},
@@ -26,5 +46,3 @@ def dict_endpoint(request: Request):
         ],
         text_format=DictionaryEntry,
     )
-
-    return Response(content=response.output_parsed)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Request, HTTPException, Response
+from managers.replay_manager import replay_store
+
+replay_router = APIRouter()
+
+
+def parse_range(range_header: str, length: int):
+    """
+    Parse a single "bytes=" range into a half-open (start, end) pair.
+
+    Returns:
+        Optional[Tuple[int, int]]: The range, or None if it is unsatisfiable
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if not start_text:
+            # Suffix range: the last N bytes
+            start, end = max(length - int(end_text), 0), length
+        else:
+            start = int(start_text)
+            end = int(end_text) + 1 if end_text else length
+    except ValueError:
+        return None
+
+    end = min(end, length)
+    if start >= end:
+        return None
+    return start, end
+
+
+@replay_router.get(
+    "/replay/{conversation_id}/{message_id}",
+    summary="Replay a previously synthesized assistant message",
+)
+async def replay_endpoint(request: Request, conversation_id: str, message_id: str):
+    entry = replay_store.get(conversation_id, message_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No audio stored for this message")
+
+    media_type = f"audio/L16; rate={entry.sample_rate}; channels=1"
+    headers = {"Accept-Ranges": "bytes"}
+
+    range_header = request.headers.get("Range")
+    if not range_header:
+        return Response(
+            content=replay_store.read(entry), media_type=media_type, headers=headers
+        )
+
+    byte_range = parse_range(range_header, entry.length)
+    if byte_range is None:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{entry.length}"},
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{entry.length}"
+    return Response(
+        content=replay_store.read(entry, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
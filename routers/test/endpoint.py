@@ -1,4 +1,7 @@
 from fastapi import APIRouter, Request, HTTPException
+from managers.admission_manager import admission
+from managers.llm_manager import llm_manager
+from helper.tts_frontend import frontend_stats
 
 test_router = APIRouter()
 
@@ -6,3 +9,18 @@ test_router = APIRouter()
 @test_router.get("/ping", summary="Health check endpoint")
 async def ping():
     return {"message": "pong"}
+
+
+@test_router.get("/admission", summary="Admission queue depth and wait time")
+async def admission_stats():
+    return admission.stats()
+
+
+@test_router.get("/llm/usage", summary="Prompt token and prefix cache usage per route")
+async def llm_usage():
+    return llm_manager.usage_stats()
+
+
+@test_router.get("/tts/stats", summary="TTS front-end vs model time and cache hits")
+async def tts_stats():
+    return frontend_stats.snapshot()
@@ -1,13 +1,23 @@
 from fastapi import APIRouter, WebSocket, Request, WebSocketDisconnect
 from piper import PiperVoice
-from helper.prompt_loader import load_prompt_to_messages
-from helper.prompt_loader import set_prompt_to_messages
-from openai import OpenAI
+from helper.prompt_loader import assemble_prompt
 import logging
 from managers.websocket_manager import manager
+from managers.llm_manager import llm_manager
+from managers.filler_manager import FillerManager
+from managers.admission_manager import admission, AdmissionRejected, Priority
+from managers.replay_manager import replay_store
+from managers.summary_manager import summary_manager
+from managers.session_manager import Session, session_manager
+from constants.admission import ADMISSION_CLOSE_CODE
+from helper.audio_processing import AudioPostProcessor, synthesis_config
+from helper.sentence_splitter import iter_sentences
+from helper.tiered_voice import TieredVoice
 import constants.symbol as const
-import os
-from dotenv import load_dotenv
+from constants.filler import FILLER_PHRASES, FILLER_THRESHOLD_SECONDS
+from constants.voice import TIER_QUALITY
+import asyncio
+from typing import Optional
 import http.client
 import json
 import ssl
@@ -16,6 +26,8 @@ websocket_router = APIRouter()
 
 
 voice = PiperVoice.load(r"voices\en_US-hfc_female-medium\en_US-hfc_female-medium.onnx")
+tiered_voice = TieredVoice(voice)
+fillers = FillerManager(voice, {"Lexa": FILLER_PHRASES["Lexa"]})
 
 
 def get_conversation_context(conversation_id: str) -> str:
@@ -32,6 +44,7 @@ def get_conversation_context(conversation_id: str) -> str:
 
 
 def save_assistant_conversation_message(conversation_id: str, message: str):
+    """Save the assistant message and return its id from the backend, if any."""
     conn = http.client.HTTPSConnection(
         "localhost", 7185, context=ssl._create_unverified_context()
     )
@@ -41,16 +54,179 @@ def save_assistant_conversation_message(conversation_id: str, message: str):
         "POST", f"/api/ai/conversations/{conversation_id}/messages", payload, headers
     )
     response = conn.getresponse()
+    response_body = response.read()
+    conn.close()
     if response.status != 200:
         logging.error(f"Failed to save message: {response.status} {response.reason}")
-    conn.close()
+        return None
+    try:
+        return json.loads(response_body.decode("utf-8")).get("id")
+    except (ValueError, AttributeError):
+        return None
+
+
+async def run_legacy_turn(
+    websocket: WebSocket,
+    payload: dict,
+    messages: list,
+    segment_tokens: dict,
+    audio_out: list,
+) -> str:
+    """
+    Full text frame, untyped audio frames, then VOICE_STREAM_END.
+
+    No filler clip is sent: legacy clients expect the text frame before any
+    audio, and a clip after the full reply would no longer mask latency.
+    """
+    output_text = "".join(
+        [
+            token
+            async for token in llm_manager.stream("ws_chat", messages, segment_tokens)
+        ]
+    )
+
+    tts_gen = tiered_voice.synthesize(
+        output_text,
+        TIER_QUALITY,
+        synthesis_config(payload.get("speaking_rate")),
+    )
+    post_processor = AudioPostProcessor(voice.config.sample_rate)
+
+    await websocket.send_text(output_text)
+
+    async for pcm in tts_gen:
+        pcm = post_processor.process(pcm)
+        audio_out.append(pcm)
+        await websocket.send_bytes(pcm)
+
+    await websocket.send_text(const.VOICE_STREAM_END)
+
+    return output_text
+
+
+async def run_framed_turn(
+    session: Session,
+    payload: dict,
+    messages: list,
+    segment_tokens: dict,
+    audio_out: list,
+) -> str:
+    """
+    Per-sentence TEXT and AUDIO frames aligned by UTF-8 byte offsets into
+    the turn text.
+    """
+    syn_config = synthesis_config(payload.get("speaking_rate"))
+    post_processor = AudioPostProcessor(voice.config.sample_rate)
+    sentences = iter_sentences(llm_manager.stream("ws_chat", messages, segment_tokens))
+    writer = session.writer
+    output_text = ""
+    # Length of output_text in UTF-8 bytes, the unit of the frame offsets
+    output_bytes = 0
+    index = 0
+
+    await session.send(writer.turn_start(voice.config.sample_rate))
+
+    # Mask latency with a filler clip if no reply audio arrives in time
+    first_audio = asyncio.Event()
+
+    async def send_filler():
+        try:
+            await asyncio.wait_for(first_audio.wait(), FILLER_THRESHOLD_SECONDS)
+        except asyncio.TimeoutError:
+            clip = fillers.pick("Lexa", messages)
+            if clip:
+                await session.send(writer.filler(clip))
+
+    filler_task = asyncio.ensure_future(send_filler())
+    try:
+        async for sentence in sentences:
+            if output_text:
+                output_text += " "
+                output_bytes += 1
+            text_start = output_bytes
+            output_text += sentence
+            output_bytes += len(sentence.encode("utf-8"))
+            text_end = output_bytes
+
+            await session.send(writer.text(sentence, text_start, text_end))
+            # Fast tier for the opening sentence(s) to cut time-to-first-audio
+            tier = tiered_voice.choose_tier("Lexa", index)
+            async for pcm in tiered_voice.synthesize(sentence, tier, syn_config):
+                if not first_audio.is_set():
+                    first_audio.set()
+                    # A filler already being sent goes out before the reply
+                    await filler_task
+                pcm = post_processor.process(pcm)
+                audio_out.append(pcm)
+                await session.send(writer.audio(pcm, text_start, text_end))
+            index += 1
+    finally:
+        first_audio.set()
+        if not filler_task.done():
+            filler_task.cancel()
+            await asyncio.wait({filler_task})
+
+    await session.send(writer.turn_end(output_text))
+
+    return output_text
+
+
+async def run_turn(
+    conversation_id: str,
+    context: str,
+    payload: dict,
+    websocket: WebSocket,
+    session: Optional[Session],
+):
+    """Run one assistant turn, then save the message and keep its audio."""
+    history = summary_manager.compact(
+        conversation_id,
+        [m for m in payload["messages"] if m.get("role") != "system"],
+    )
+    messages, segment_tokens = assemble_prompt(history, "Lexa", context)
+
+    tenant = str(payload.get("user_id") or conversation_id)
+    audio_out = []
+    async with admission.admit(tenant, Priority.INTERACTIVE):
+        if session is not None:
+            output_text = await run_framed_turn(
+                session, payload, messages, segment_tokens, audio_out
+            )
+        else:
+            output_text = await run_legacy_turn(
+                websocket, payload, messages, segment_tokens, audio_out
+            )
+
+    message_id = save_assistant_conversation_message(conversation_id, output_text)
+    if message_id is not None:
+        # Keep the audio so "play again" is served without re-synthesis
+        replay_store.append(
+            conversation_id,
+            str(message_id),
+            b"".join(audio_out),
+            voice.config.sample_rate,
+        )
 
 
 @websocket_router.websocket("/ws/chat/{conversation_id}")
 async def voicechat_endpoint(websocket: WebSocket, conversation_id: str):
-    await websocket.accept()
+    # Clients opt into the framed protocol through subprotocol negotiation
+    framed = const.FRAMED_PROTOCOL_V1 in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=const.FRAMED_PROTOCOL_V1 if framed else None)
     manager.add_connection(conversation_id, websocket)
 
+    session = None
+    if framed:
+        # Reconnecting clients pass the last sequence number they received
+        last_seq = websocket.query_params.get("last_seq")
+        session, resumed = await session_manager.attach(
+            conversation_id,
+            websocket,
+            int(last_seq) if last_seq and last_seq.isdigit() else None,
+        )
+        if not resumed:
+            await session.send(session.writer.error("Resume unavailable"))
+
     context = get_conversation_context(conversation_id)
 
     try:
@@ -64,39 +240,57 @@ async def voicechat_endpoint(websocket: WebSocket, conversation_id: str):
                 )
                 return
 
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-            response = client.chat.completions.create(
-                model="gpt-4.1",
-                messages=(
-                    set_prompt_to_messages(messages, context)
-                    if context is not None
-                    else load_prompt_to_messages(messages, "Lexa")
-                ),
-            )
-
-            output_text = response.choices[0].message.content
-
-            save_assistant_conversation_message(conversation_id, output_text)
-
-            tts_gen = voice.synthesize(output_text)
-
-            await websocket.send_text(output_text)
-
-            for chunk in tts_gen:
-                await websocket.send_bytes(chunk.audio_int16_bytes)
-
-            await websocket.send_text(const.VOICE_STREAM_END)
+            try:
+                if session is not None:
+                    # One turn at a time per conversation, even across reconnects.
+                    # The turn runs as its own task so it survives this socket.
+                    async with session.turn_lock:
+                        session.turn_task = asyncio.ensure_future(
+                            run_turn(
+                                conversation_id, context, payload, websocket, session
+                            )
+                        )
+                        try:
+                            await asyncio.shield(session.turn_task)
+                        except asyncio.CancelledError:
+                            # The session expired and cancelled the turn while
+                            # this handler still waited on it. Return quietly
+                            # unless the handler was cancelled too
+                            # (Task.cancelling() exists on Python 3.11+).
+                            cancelling = getattr(
+                                asyncio.current_task(), "cancelling", None
+                            )
+                            if session.turn_task.cancelled() and not (
+                                cancelling and cancelling()
+                            ):
+                                return
+                            raise
+                else:
+                    await run_turn(conversation_id, context, payload, websocket, None)
+            except AdmissionRejected as e:
+                if session is not None:
+                    await session.send(session.writer.error(str(e)))
+                await websocket.close(
+                    code=ADMISSION_CLOSE_CODE,
+                    reason=f"retry_after={int(e.retry_after)}",
+                )
+                manager.remove_connection(conversation_id, websocket)
+                return
 
     except WebSocketDisconnect:
         # Connection was closed by client, just remove from manager
-        # Don't try to close again as it's already closed
-        manager.remove_connection(conversation_id)
+        # Don't try to close again as it's already closed.
+        # A resumed connection may already be registered under the same id,
+        # so only this socket's entry is removed.
+        manager.remove_connection(conversation_id, websocket)
     except Exception as e:
         logging.error(f"Error in WebSocket endpoint: {e}")
+        if session is not None and session.websocket is websocket:
+            await session.send(session.writer.error(str(e)))
         # Only try to close if connection is still active
-        try:
-            await manager.close_connection(conversation_id)
-        except:
-            # If closing fails, just remove from manager
-            manager.remove_connection(conversation_id)
+        await manager.close_connection(conversation_id, websocket)
+    finally:
+        if session is not None:
+            # Keep the session and any in-flight turn for the grace period;
+            # detach leaves the session alone if a newer socket took over
+            session_manager.detach(session, websocket)
@@ -0,0 +1,82 @@
+"""
+Benchmark for the audio post-processing stage: bytes saved by silence
+trimming and per-chunk processing overhead.
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helper.audio_processing import AudioPostProcessor
+
+SAMPLE_RATE = 22050
+
+
+def make_sentence(rng, voiced_seconds, silence_seconds, amplitude):
+    """Synthetic sentence: noisy tone surrounded by leading/trailing silence."""
+    silence = np.zeros(int(SAMPLE_RATE * silence_seconds), dtype=np.float32)
+    t = np.arange(int(SAMPLE_RATE * voiced_seconds)) / SAMPLE_RATE
+    voiced = amplitude * np.sin(2 * np.pi * 220 * t) + 0.01 * rng.standard_normal(
+        t.size
+    )
+    audio = np.concatenate([silence, voiced.astype(np.float32), silence])
+    return (audio * 32767).astype(np.int16).tobytes()
+
+
+def load_piper_chunks(text):
+    """Use real Piper output if a voice model is available."""
+    from piper import PiperVoice
+
+    voice = PiperVoice.load(
+        r"voices\en_US-hfc_female-medium\en_US-hfc_female-medium.onnx"
+    )
+    return voice.config.sample_rate, [
+        chunk.audio_int16_bytes for chunk in voice.synthesize(text)
+    ]
+
+
+def benchmark(sample_rate, chunks):
+    processor = AudioPostProcessor(sample_rate)
+    bytes_in = bytes_out = 0
+    timings = []
+
+    for chunk in chunks:
+        start = time.perf_counter()
+        processed = processor.process(chunk)
+        timings.append(time.perf_counter() - start)
+        bytes_in += len(chunk)
+        bytes_out += len(processed)
+
+    saved = bytes_in - bytes_out
+    print(f"Chunks:           {len(chunks)}")
+    print(f"Bytes in:         {bytes_in}")
+    print(f"Bytes out:        {bytes_out}")
+    print(f"Bytes saved:      {saved} ({saved / bytes_in:.1%})")
+    print(f"Playback saved:   {saved / 2 / sample_rate:.2f} s")
+    print(f"Mean per chunk:   {np.mean(timings) * 1000:.3f} ms")
+    print(f"Max per chunk:    {np.max(timings) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    print("Audio post-processing benchmark")
+    print("=" * 60)
+
+    try:
+        sample_rate, chunks = load_piper_chunks(
+            "Hello there. This is a test of the post-processing stage. "
+            "Each sentence is synthesized separately, with silence at both ends."
+        )
+        print("Using Piper output")
+    except Exception as e:
+        print(f"Piper unavailable ({e}), using synthetic sentences")
+        rng = np.random.default_rng(0)
+        sample_rate = SAMPLE_RATE
+        chunks = [
+            make_sentence(rng, rng.uniform(1.0, 3.0), 0.4, rng.uniform(0.05, 0.6))
+            for _ in range(50)
+        ]
+
+    benchmark(sample_rate, chunks)
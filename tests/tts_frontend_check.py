@@ -0,0 +1,113 @@
+"""
+Table-driven check for the TTS text front end: what normalize_text hands to
+espeak, and how it is split into sentences, both for whole replies (legacy
+WebSocket path) and for streamed tokens (framed WebSocket and HTTP paths).
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helper.tts_frontend import normalize_text
+from helper.sentence_splitter import iter_sentences, split_sentences
+
+# Streamed replies are split with iter_sentences, fed this many characters
+# per token, before each piece is normalized
+TOKEN_SIZES = [1, 3, 50]
+
+# (input, expected sentences after normalization)
+CASES = [
+    # Numbers, ordinals, times, dates and currency are left to espeak
+    ("I'm 1st in line", ["I'm 1st in line"]),
+    ("2*3=6", ["2*3=6"]),
+    ("Meet at 3:30 on 12/25/2024.", ["Meet at 3:30 on 12/25/2024."]),
+    ("It costs $1,250.50 today.", ["It costs $1,250.50 today."]),
+    ("Growth was 12.5% this year.", ["Growth was 12.5% this year."]),
+    # List items and line breaks are sentence boundaries
+    ("1. First item\n2. Second item", ["First item.", "Second item"]),
+    ("Steps:\n- Mix it\n- Bake it!", ["Steps.", "Mix it.", "Bake it!"]),
+    ("# Title\nSome text.", ["Title.", "Some text."]),
+    ("Hello\n\nWorld", ["Hello.", "World"]),
+    # Emphasis markers are stripped only when they wrap words
+    (
+        "This is **very** important and *really* _nice_.",
+        ["This is very important and really nice."],
+    ),
+    ("Use snake_case_names here", ["Use snake_case_names here"]),
+    ("a * b * c", ["a * b * c"]),
+    ("Call `foo()` now 🎉", ["Call foo() now"]),
+    # Links, URLs and abbreviations
+    (
+        "See [the docs](http://x.y) or http://a.b/c e.g. now.",
+        ["See the docs or for example now."],
+    ),
+    ("Dr. Smith & me", ["doctor Smith and me"]),
+]
+
+# (streamed reply, expected spoken sentences)
+STREAM_CASES = [
+    (
+        "Steps:\n1. Mix the flour.\n2. Bake it.",
+        ["Steps:", "Mix the flour.", "Bake it."],
+    ),
+    ("Use **bold text. And more** here.", ["Use bold text.", "And more here."]),
+    (
+        "Here:\n```python\nprint(1)\nx = 2. y\n```\nDone. Next.",
+        ["Here:", "Done.", "Next."],
+    ),
+    ("Unclosed:\n```js\nfoo()", ["Unclosed:"]),
+    (
+        "Ask Dr. Smith, e.g. about taxes vs. fees. Then go.",
+        ["Ask doctor Smith, for example about taxes versus fees.", "Then go."],
+    ),
+    (
+        "# Title\n- item one\n- item *two*\n\nEnd",
+        ["Title", "item one", "item two", "End"],
+    ),
+    ("2*3=6. Is it?", ["2*3=6.", "Is it?"]),
+    ("I'm 1st in line. Version 2. Next", ["I'm 1st in line.", "Version 2.", "Next"]),
+]
+
+
+async def stream_tokens(text, size):
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+async def spoken_sentences(text, size):
+    """What the streaming paths synthesize: split first, then normalize."""
+    return [
+        sentence
+        async for piece in iter_sentences(stream_tokens(text, size))
+        for sentence in split_sentences(normalize_text(piece))
+    ]
+
+
+def check(label, text, actual, expected):
+    if actual == expected:
+        print(f"ok   {label}{text!r} -> {actual!r}")
+        return True
+    print(f"FAIL {label}{text!r} -> {actual!r}, expected {expected!r}")
+    return False
+
+
+def main():
+    total = passed = 0
+    for text, expected in CASES:
+        total += 1
+        passed += check("", text, split_sentences(normalize_text(text)), expected)
+
+    for text, expected in STREAM_CASES:
+        for size in TOKEN_SIZES:
+            total += 1
+            actual = asyncio.run(spoken_sentences(text, size))
+            passed += check(f"[stream/{size}] ", text, actual, expected)
+
+    print(f"\n{passed}/{total} cases passed")
+    return 0 if passed == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())